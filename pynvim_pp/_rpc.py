@@ -34,6 +34,7 @@ from typing import (
     Tuple,
     Type,
 )
+from uuid import UUID
 
 from msgpack import ExtType, Packer, Unpacker
 
@@ -163,6 +164,7 @@ class _RPClient(RPClient):
         self._loop, self._uids = get_running_loop(), map(_MSG_ID, count())
         self._tx, self._rx = tx, rx
         self._methods = notifs
+        self._refcounts: MutableMapping[Method, Tuple[UUID, int]] = {}
         self._chan: Optional[Chan] = None
 
     @cached_property
@@ -189,11 +191,39 @@ class _RPClient(RPClient):
         f = run_coroutine_threadsafe(cont(), self._loop)
         return await wrap_future(f)
 
-    def register(self, f: RPCallable) -> None:
+    @property
+    def registered(self) -> Mapping[Method, int]:
         with self._lock:
-            assert f.method not in self._methods
-            wrapped = _wrap(self._foreign_loop, tx=self._tx, fn=f)
-            self._methods[f.method] = wrapped
+            return {method: refs for method, (_, refs) in self._refcounts.items()}
+
+    def register(self, f: RPCallable) -> bool:
+        with self._lock:
+            if acc := self._refcounts.get(f.method):
+                uuid, refs = acc
+                assert uuid == f.uuid
+                self._refcounts[f.method] = (uuid, refs + 1)
+                return False
+            else:
+                assert f.method not in self._methods
+                wrapped = _wrap(self._foreign_loop, tx=self._tx, fn=f)
+                self._methods[f.method] = wrapped
+                self._refcounts[f.method] = (f.uuid, 1)
+                return True
+
+    def unregister(self, f: RPCallable) -> bool:
+        with self._lock:
+            if acc := self._refcounts.get(f.method):
+                uuid, refs = acc
+                assert uuid == f.uuid
+                if refs > 1:
+                    self._refcounts[f.method] = (uuid, refs - 1)
+                    return False
+                else:
+                    self._refcounts.pop(f.method)
+                    self._methods.pop(f.method, None)
+                    return True
+            else:
+                return False
 
 
 @asynccontextmanager
@@ -0,0 +1,57 @@
+return (function(chan, specs)
+  local fields = {
+    win = function()
+      return vim.api.nvim_get_current_win()
+    end,
+    cursor = function()
+      local row, col = unpack(vim.api.nvim_win_get_cursor(0))
+      return {row - 1, col}
+    end,
+    line = function()
+      return vim.api.nvim_get_current_line()
+    end,
+    mode = function()
+      return vim.api.nvim_get_mode().mode
+    end,
+    filetype = function(args)
+      return vim.api.nvim_buf_get_option(args.buf, "filetype")
+    end,
+    changedtick = function(args)
+      return vim.api.nvim_buf_get_changedtick(args.buf)
+    end,
+    cwd = function()
+      return vim.api.nvim_call_function("getcwd", {})
+    end
+  }
+
+  local new_callback = function(method, payload)
+    return function(args)
+      local acc = {}
+      for i, key in ipairs(payload) do
+        local fetch = fields[key]
+        local val = args[key]
+        if fetch then
+          val = fetch(args)
+        end
+        if val == nil then
+          acc[i] = vim.NIL
+        else
+          acc[i] = val
+        end
+      end
+      vim.rpcnotify(chan, method, unpack(acc, 1, #payload))
+    end
+  end
+
+  for _, spec in ipairs(specs) do
+    local group = vim.api.nvim_create_augroup(spec.name, {clear = true})
+    local opts = spec.opts
+    opts.group = group
+    if spec.method then
+      opts.callback = new_callback(spec.method, spec.payload)
+    else
+      opts.command = spec.rhs
+    end
+    vim.api.nvim_create_autocmd(spec.events, opts)
+  end
+end)(...)
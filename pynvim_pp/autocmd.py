@@ -2,10 +2,40 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from inspect import currentframe
-from typing import Callable, MutableMapping, Optional, Sequence
+from typing import (
+    Any,
+    Callable,
+    Literal,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+)
 from uuid import uuid4
 
 from .atomic import Atomic
+from .lib import decode
+from .rpc_types import Method, RPCallable
+from .types import PARENT, HasChan
+
+AuField = Literal[
+    "buf",
+    "file",
+    "match",
+    "event",
+    "id",
+    "data",
+    "win",
+    "cursor",
+    "line",
+    "mode",
+    "filetype",
+    "changedtick",
+    "cwd",
+]
+
+_LUA_AU = decode((PARENT / "autocmd.lua").read_bytes().strip())
 
 
 def _name_gen() -> str:
@@ -22,7 +52,29 @@ def _name_gen() -> str:
 class _AuParams:
     events: Sequence[str]
     modifiers: Sequence[str]
-    rhs: str
+    rhs: Optional[str]
+    method: Optional[Method] = None
+    payload: Sequence[AuField] = ()
+
+
+def _lua_opts(modifiers: Sequence[str]) -> Mapping[str, Any]:
+    opts: MutableMapping[str, Any] = {}
+    patterns: MutableSequence[str] = []
+    for mod in modifiers:
+        if mod == "++once":
+            opts["once"] = True
+        elif mod == "++nested":
+            opts["nested"] = True
+        elif mod == "<buffer>":
+            opts["buffer"] = 0
+        elif mod.startswith("<buffer=") and mod[8:-1].isdigit():
+            opts["buffer"] = int(mod[8:-1])
+        else:
+            patterns.extend(mod.split(","))
+
+    if patterns and "buffer" not in opts:
+        opts["pattern"] = patterns
+    return opts
 
 
 class _A:
@@ -41,8 +93,17 @@ class _A:
             events=self._events, modifiers=self._modifiers, rhs=rhs
         )
 
+    def notify(self, handler: RPCallable[Any], *payload: AuField) -> None:
+        self._parent._autocmds[self._name] = _AuParams(
+            events=self._events,
+            modifiers=self._modifiers,
+            rhs=None,
+            method=handler.method,
+            payload=payload,
+        )
+
 
-class AutoCMD:
+class AutoCMD(HasChan):
     def __init__(self, name_gen: Callable[[], str] = _name_gen) -> None:
         self._autocmds: MutableMapping[str, _AuParams] = {}
         self._name_gen = name_gen
@@ -59,15 +120,29 @@ class AutoCMD:
             name=c_name, events=(event, *events), modifiers=modifiers, parent=self
         )
 
-    def drain(self) -> Atomic:
+    def drain(self, lua: bool = False) -> Atomic:
         atomic = Atomic()
+        specs: MutableSequence[Mapping[str, Any]] = []
         while self._autocmds:
             name, param = self._autocmds.popitem()
-            events = ",".join(param.events)
-            modifiers = " ".join(param.modifiers)
-            atomic.command(f"augroup {name}")
-            atomic.command("autocmd!")
-            atomic.command(f"autocmd {events} {modifiers} {param.rhs}")
-            atomic.command("augroup END")
+            if lua or param.method:
+                spec = {
+                    "name": name,
+                    "events": param.events,
+                    "opts": _lua_opts(param.modifiers),
+                    "rhs": param.rhs,
+                    "method": param.method,
+                    "payload": param.payload,
+                }
+                specs.append(spec)
+            else:
+                events = ",".join(param.events)
+                modifiers = " ".join(param.modifiers)
+                atomic.command(f"augroup {name}")
+                atomic.command("autocmd!")
+                atomic.command(f"autocmd {events} {modifiers} {param.rhs}")
+                atomic.command("augroup END")
 
+        if specs:
+            atomic.execute_lua(_LUA_AU, (self.chan, specs))
         return atomic
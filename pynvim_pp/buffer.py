@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from difflib import SequenceMatcher
 from functools import cached_property
 from string import ascii_lowercase
 from typing import (
+    AbstractSet,
     Any,
+    AsyncIterator,
     Iterable,
     Iterator,
     Literal,
@@ -20,15 +23,33 @@ from typing import (
 from msgpack import Packer
 
 from .atomic import Atomic
+from .handler import GLOBAL_NS
 from .lib import decode, encode
-from .rpc_types import ExtData, MsgPackBuffer
-from .types import BufNamespace, HasVOL, NoneType, NvimPos
+from .rpc_types import ExtData, MsgPackBuffer, NvimError
+from .types import PARENT, BufNamespace, HasVOL, NoneType, NvimPos
+
+_LUA_HL = decode((PARENT / "highlights.lua").read_bytes().strip())
+
+_LUA_HL_CALL = """
+local gns, argv = ...
+local fn = _G[gns] and rawget(_G[gns], "pynvim_pp_add_hl")
+if fn then
+  fn(unpack(argv))
+  return true
+else
+  return false
+end
+"""
 
 ExtMarker = NewType("ExtMarker", int)
 BufMarker = NewType("BufMarker", str)
 BufNum = NewType("BufNum", int)
 
 
+class BufferChanged(Exception):
+    ...
+
+
 @dataclass(frozen=True)
 class ExtMark:
     buf: Buffer
@@ -44,6 +65,63 @@ class ExtMark:
             return ()
 
 
+BufField = Literal[
+    "name", "filetype", "changed_tick", "line_count", "loaded", "modifiable"
+]
+
+_BUF_FIELDS: Mapping[BufField, Tuple[str, Sequence[Any]]] = {
+    "name": ("buf_get_name", ()),
+    "filetype": ("buf_get_option", ("filetype",)),
+    "changed_tick": ("buf_get_changedtick", ()),
+    "line_count": ("buf_line_count", ()),
+    "loaded": ("buf_is_loaded", ()),
+    "modifiable": ("buf_get_option", ("modifiable",)),
+}
+
+
+@dataclass(frozen=True)
+class BufSnapshot:
+    buf: Buffer
+    name: Optional[str] = None
+    filetype: Optional[str] = None
+    changed_tick: Optional[int] = None
+    line_count: Optional[int] = None
+    loaded: Optional[bool] = None
+    modifiable: Optional[bool] = None
+    lines: Optional[Sequence[str]] = None
+
+
+def _mark_end(meta: Mapping[str, Any]) -> Optional[NvimPos]:
+    if (end_row := meta.get("end_row")) is not None and (
+        end_col := meta.get("end_col")
+    ) is not None:
+        return end_row, end_col
+    else:
+        return None
+
+
+class SlimExtMark:
+    __slots__ = ("marker", "begin", "meta")
+
+    def __init__(
+        self, marker: ExtMarker, begin: NvimPos, meta: Optional[Mapping[str, Any]]
+    ) -> None:
+        self.marker, self.begin, self.meta = marker, begin, meta
+
+    @property
+    def end(self) -> Optional[NvimPos]:
+        return _mark_end(self.meta) if self.meta else None
+
+    def expand(self, buf: Buffer) -> ExtMark:
+        return ExtMark(
+            buf=buf,
+            marker=self.marker,
+            begin=self.begin,
+            end=self.end,
+            meta=self.meta or {},
+        )
+
+
 def linefeed(lf: str) -> Literal["\r\n", "\n", "\r"]:
     if lf == "dos":
         return "\r\n"
@@ -55,6 +133,42 @@ def linefeed(lf: str) -> Literal["\r\n", "\n", "\r"]:
         raise ValueError(lf)
 
 
+def diff_lines(
+    old: Sequence[str], new: Sequence[str]
+) -> Iterator[Tuple[int, int, Sequence[str]]]:
+    limit = min(len(old), len(new))
+    pre = 0
+    while pre < limit and old[pre] == new[pre]:
+        pre += 1
+
+    limit -= pre
+    suf = 0
+    while suf < limit and old[-suf - 1] == new[-suf - 1]:
+        suf += 1
+
+    old_mid, new_mid = old[pre : len(old) - suf], new[pre : len(new) - suf]
+    ids: MutableMapping[str, int] = {}
+    lhs = tuple(ids.setdefault(line, len(ids)) for line in old_mid)
+    rhs = tuple(ids.setdefault(line, len(ids)) for line in new_mid)
+
+    matcher = SequenceMatcher(a=lhs, b=rhs)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op != "equal":
+            yield pre + i1, pre + i2, new_mid[j1:j2]
+
+
+def _set_extmark(atomic: Atomic, buf: Buffer, ns: BufNamespace, mark: ExtMark) -> None:
+    (r1, c1) = mark.begin
+    opts: MutableMapping[str, Any] = {
+        **mark.meta,
+        "id": mark.marker,
+    }
+    if end := mark.end:
+        r2, c2 = end
+        opts.update(end_line=r2, end_col=c2)
+    atomic.buf_set_extmark(buf, ns, r1, c1, opts)
+
+
 class Buffer(MsgPackBuffer, HasVOL):
     prefix = "nvim_buf"
     _packer = Packer()
@@ -79,6 +193,35 @@ class Buffer(MsgPackBuffer, HasVOL):
         else:
             return bufs
 
+    @classmethod
+    async def snapshot_many(
+        cls,
+        bufs: Iterable[Buffer],
+        fields: Iterable[BufField] = ("name", "filetype", "changed_tick", "line_count"),
+        lines: bool = False,
+    ) -> Sequence[BufSnapshot]:
+        bufs, fields = tuple(bufs), tuple(fields)
+        atomic = Atomic()
+        for buf in bufs:
+            for field in fields:
+                instruction, args = _BUF_FIELDS[field]
+                getattr(atomic, instruction)(buf, *args)
+            if lines:
+                atomic.buf_get_lines(buf, 0, -1, True)
+
+        stride = len(fields) + lines
+        values = await atomic.commit(NoneType) if stride and bufs else ()
+
+        def cont() -> Iterator[BufSnapshot]:
+            for idx, buf in enumerate(bufs):
+                row = values[idx * stride : (idx + 1) * stride]
+                attrs: MutableMapping[str, Any] = dict(zip(fields, row))
+                if lines:
+                    attrs.update(lines=row[-1])
+                yield BufSnapshot(buf=buf, **attrs)
+
+        return tuple(cont())
+
     @classmethod
     async def get_current(cls) -> Buffer:
         return await cls.api.get_current_buf(Buffer, prefix=cls.base_prefix)
@@ -148,9 +291,44 @@ class Buffer(MsgPackBuffer, HasVOL):
             await self.api.get_lines(NoneType, self, lo, hi, True),
         )
 
+    async def stream_lines(
+        self, lo: int = 0, hi: int = -1, page: int = 4096
+    ) -> AsyncIterator[Sequence[str]]:
+        assert page > 0
+        with Atomic() as (atomic, ns):
+            ns.tick = atomic.buf_get_changedtick(self)
+            ns.count = atomic.buf_line_count(self)
+            await atomic.commit(NoneType)
+
+        tick, count = ns.tick(int), ns.count(int)
+        lo = lo if lo >= 0 else count + lo + 1
+        hi = min(count, hi if hi >= 0 else count + hi + 1)
+
+        for idx in range(lo, hi, page):
+            with Atomic() as (atomic, ns):
+                ns.tick = atomic.buf_get_changedtick(self)
+                ns.lines = atomic.buf_get_lines(self, idx, min(hi, idx + page), True)
+                await atomic.commit(NoneType)
+
+            if (new_tick := ns.tick(int)) != tick:
+                raise BufferChanged((self, tick, new_tick))
+            else:
+                yield cast(Sequence[str], ns.lines(NoneType))
+
     async def set_lines(self, lines: Sequence[str], lo: int = 0, hi: int = -1) -> None:
         await self.api.set_lines(NoneType, self, lo, hi, True, lines)
 
+    async def patch_lines(
+        self, lines: Sequence[str], current: Optional[Sequence[str]] = None
+    ) -> None:
+        old = await self.get_lines() if current is None else current
+        atomic = Atomic()
+        for lo, hi, replacement in reversed(tuple(diff_lines(old, lines))):
+            atomic.buf_set_lines(self, lo, hi, True, replacement)
+
+        if any(atomic):
+            await atomic.commit(NoneType)
+
     async def get_text(self, begin: NvimPos, end: NvimPos) -> Sequence[str]:
         (r1, c1), (r2, c2) = begin, end
         if await self.api.has("nvim-0.6"):
@@ -202,35 +380,64 @@ class Buffer(MsgPackBuffer, HasVOL):
 
         def cont() -> Iterator[ExtMark]:
             for idx, row, col, meta in marks:
-                end = (
-                    (end_row, end_col)
-                    if (end_row := meta.get("end_row")) is not None
-                    and (end_col := meta.get("end_col")) is not None
-                    else None
-                )
                 mark = ExtMark(
                     buf=self,
                     marker=ExtMarker(idx),
                     begin=(row, col),
-                    end=end,
+                    end=_mark_end(meta),
                     meta=meta,
                 )
                 yield mark
 
         return tuple(cont())
 
+    async def stream_extmarks(
+        self,
+        ns: BufNamespace,
+        begin: NvimPos = (0, 0),
+        end: NvimPos = (-1, -1),
+        page: int = 1024,
+        details: bool = True,
+    ) -> AsyncIterator[SlimExtMark]:
+        assert page > 0
+        cursor, limit = begin, page
+        seen: AbstractSet[int] = frozenset()
+        while True:
+            marks = cast(
+                Sequence[Sequence[Any]],
+                await self.api.get_extmarks(
+                    NoneType,
+                    self,
+                    ns,
+                    cursor,
+                    end,
+                    {"limit": limit, "details": details},
+                ),
+            )
+
+            for mark in marks:
+                idx, row, col = mark[:3]
+                if (row, col) != cursor or idx not in seen:
+                    yield SlimExtMark(
+                        marker=ExtMarker(idx),
+                        begin=(row, col),
+                        meta=mark[3] if details else None,
+                    )
+
+            if len(marks) < limit:
+                break
+            else:
+                pos = cast(NvimPos, tuple(marks[-1][1:3]))
+                at_pos = {mark[0] for mark in marks if tuple(mark[1:3]) == pos}
+                if pos == cursor:
+                    seen, limit = seen | at_pos, limit * 2
+                else:
+                    cursor, seen, limit = pos, at_pos, page
+
     async def set_extmarks(self, ns: BufNamespace, extmarks: Iterable[ExtMark]) -> None:
         atomic = Atomic()
         for mark in extmarks:
-            (r1, c1) = mark.begin
-            opts: MutableMapping[str, Any] = {
-                **mark.meta,
-                "id": mark.marker,
-            }
-            if end := mark.end:
-                r2, c2 = end
-                opts.update(end_line=r2, end_col=c2)
-            atomic.buf_set_extmark(self, ns, r1, c1, opts)
+            _set_extmark(atomic, buf=self, ns=ns, mark=mark)
 
         await atomic.commit(NoneType)
 
@@ -242,6 +449,44 @@ class Buffer(MsgPackBuffer, HasVOL):
             atomic.buf_del_extmark(self, ns, marker)
         await atomic.commit(NoneType)
 
+    async def _add_hl(self, *argv: Any) -> None:
+        call = (GLOBAL_NS, (self, *argv))
+        if not await self.api.execute_lua(
+            bool, _LUA_HL_CALL, call, prefix=self.base_prefix
+        ):
+            atomic = Atomic()
+            atomic.execute_lua(_LUA_HL, (GLOBAL_NS,))
+            atomic.execute_lua(_LUA_HL_CALL, call)
+            await atomic.commit(NoneType)
+
+    async def add_highlights(
+        self,
+        ns: BufNamespace,
+        groups: Sequence[str],
+        rows: Sequence[int],
+        cols: Sequence[int],
+        lens: Sequence[int],
+        gids: Sequence[int],
+    ) -> None:
+        assert len(rows) == len(cols) == len(lens) == len(gids)
+        await self._add_hl(
+            ns, False, groups, tuple(rows), tuple(cols), tuple(lens), tuple(gids)
+        )
+
+    async def add_virtual_texts(
+        self,
+        ns: BufNamespace,
+        groups: Sequence[str],
+        rows: Sequence[int],
+        cols: Sequence[int],
+        texts: Sequence[str],
+        gids: Sequence[int],
+    ) -> None:
+        assert len(rows) == len(cols) == len(texts) == len(gids)
+        await self._add_hl(
+            ns, True, groups, tuple(rows), tuple(cols), tuple(texts), tuple(gids)
+        )
+
     async def get_mark(self, marker: BufMarker) -> Optional[NvimPos]:
         row, col = cast(NvimPos, await self.api.get_mark(NoneType, self, marker))
         if (row, col) == (0, 0):
@@ -268,3 +513,43 @@ class Buffer(MsgPackBuffer, HasVOL):
             if (row, col) != (0, 0)
         }
         return bookmarks
+
+
+class ExtMarkReconciler:
+    def __init__(self, buf: Buffer, ns: BufNamespace) -> None:
+        self.buf, self.ns = buf, ns
+        self._applied: Mapping[ExtMarker, ExtMark] = {}
+
+    def _reconcile(
+        self, extmarks: Iterable[ExtMark]
+    ) -> Tuple[Atomic, Mapping[ExtMarker, ExtMark]]:
+        atomic = Atomic()
+        applied = {mark.marker: mark for mark in extmarks}
+        for marker, mark in applied.items():
+            prev = self._applied.get(marker)
+            if (
+                not prev
+                or prev.begin != mark.begin
+                or prev.end != mark.end
+                or prev.meta != mark.meta
+            ):
+                _set_extmark(atomic, buf=self.buf, ns=self.ns, mark=mark)
+
+        for marker in self._applied.keys() - applied.keys():
+            atomic.buf_del_extmark(self.buf, self.ns, marker)
+
+        return atomic, applied
+
+    def reset(self) -> None:
+        self._applied = {}
+
+    async def render(self, extmarks: Iterable[ExtMark]) -> None:
+        atomic, applied = self._reconcile(extmarks)
+        if any(atomic):
+            try:
+                await atomic.commit(NoneType)
+            except NvimError:
+                self.reset()
+                raise
+
+        self._applied = applied
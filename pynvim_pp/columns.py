@@ -0,0 +1,91 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import (
+    Callable,
+    Iterable,
+    MutableMapping,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from .atomic import Atomic
+from .buffer import Buffer
+from .lib import _Encoding
+from .types import NoneType, NvimPos
+
+_CACHE_SIZE = 16
+
+_INDICES: MutableMapping[Buffer, Tuple[int, "ColumnIndex"]] = {}
+
+
+def _utf8_units(char: str) -> int:
+    code = ord(char)
+    if code < 0x80 or 0xDC80 <= code <= 0xDCFF:
+        return 1
+    elif code < 0x800:
+        return 2
+    elif code < 0x10000:
+        return 3
+    else:
+        return 4
+
+
+def _utf16_units(char: str) -> int:
+    return 2 if ord(char) >= 0x10000 else 1
+
+
+_UNITS: MutableMapping[_Encoding, Callable[[str], int]] = {
+    "UTF-8": _utf8_units,
+    "UTF-16-LE": _utf16_units,
+}
+
+
+class ColumnIndex:
+    def __init__(self, lines: Sequence[str]) -> None:
+        self._lines = lines
+        self._offsets: MutableMapping[Tuple[int, _Encoding], Sequence[int]] = {}
+
+    def _offsets_of(self, row: int, encoding: _Encoding) -> Sequence[int]:
+        line = self._lines[row]
+        if units := _UNITS.get(encoding):
+            key = (row, encoding)
+            if (offsets := self._offsets.get(key)) is None:
+                offsets = tuple(accumulate(map(units, line), initial=0))
+                self._offsets[key] = offsets
+            return offsets
+        else:
+            return range(len(line) + 1)
+
+    def convert(self, pos: NvimPos, src: _Encoding, dst: _Encoding) -> NvimPos:
+        row, col = pos
+        if src == dst or self._lines[row].isascii():
+            return pos
+        else:
+            lhs, rhs = self._offsets_of(row, src), self._offsets_of(row, dst)
+            idx = max(0, bisect_right(lhs, col) - 1)
+            return row, rhs[idx]
+
+    def convert_many(
+        self, positions: Iterable[NvimPos], src: _Encoding, dst: _Encoding
+    ) -> Sequence[NvimPos]:
+        return tuple(self.convert(pos, src=src, dst=dst) for pos in positions)
+
+
+async def column_index(buf: Buffer) -> ColumnIndex:
+    tick = await buf.changed_tick()
+    if (cached := _INDICES.pop(buf, None)) and cached[0] == tick:
+        _INDICES[buf] = cached
+        _, index = cached
+        return index
+    else:
+        with Atomic() as (atomic, ns):
+            ns.tick = atomic.buf_get_changedtick(buf)
+            ns.lines = atomic.buf_get_lines(buf, 0, -1, True)
+            await atomic.commit(NoneType)
+
+        index = ColumnIndex(cast(Sequence[str], ns.lines(NoneType)))
+        _INDICES[buf] = (ns.tick(int), index)
+        while len(_INDICES) > _CACHE_SIZE:
+            _INDICES.pop(next(iter(_INDICES)))
+        return index
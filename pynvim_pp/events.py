@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from asyncio import Event
+from dataclasses import dataclass
+from typing import AsyncIterator, MutableSet, Optional, Sequence
+from uuid import uuid4
+
+from .autocmd import AutoCMD
+from .buffer import Buffer
+from .handler import RPC
+from .types import NvimPos
+from .window import Window
+
+
+@dataclass(frozen=True)
+class CursorState:
+    win: Window
+    buf: Buffer
+    cursor: NvimPos
+    line: str
+    mode: str
+
+
+class CursorStream:
+    def __init__(
+        self,
+        rpc: RPC,
+        autocmd: AutoCMD,
+        events: Sequence[str] = ("CursorMoved", "CursorMovedI", "ModeChanged"),
+    ) -> None:
+        self._state: Optional[CursorState] = None
+        self._waiters: MutableSet[Event] = set()
+
+        @rpc(blocking=False, name=f"Pynvim_pp_cursor_{uuid4().hex}")
+        async def _on_cursor(
+            win: int, buf: int, cursor: NvimPos, line: str, mode: str
+        ) -> None:
+            row, col = cursor
+            self._state = CursorState(
+                win=Window.from_int(win),
+                buf=Buffer.from_int(buf),
+                cursor=(row, col),
+                line=line,
+                mode=mode,
+            )
+            for waiter in self._waiters:
+                waiter.set()
+
+        payload = (
+            "win_getid(), bufnr(), [line('.') - 1, col('.') - 1], getline('.'), mode()"
+        )
+        autocmd(*events) << f"call {_on_cursor.method}({payload})"
+
+    @property
+    def state(self) -> Optional[CursorState]:
+        return self._state
+
+    async def __aiter__(self) -> AsyncIterator[CursorState]:
+        waiter = Event()
+        self._waiters.add(waiter)
+        try:
+            while True:
+                await waiter.wait()
+                waiter.clear()
+                if state := self._state:
+                    yield state
+        finally:
+            self._waiters.discard(waiter)
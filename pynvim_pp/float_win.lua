@@ -0,0 +1,35 @@
+return (function(win, buf, ns, uid, margin, relsize, b_width, b_height, border)
+  local t_height = vim.api.nvim_get_option("lines")
+  local t_width = vim.api.nvim_get_option("columns")
+  local width = math.floor((t_width - margin) * relsize)
+  local height = math.floor((t_height - margin) * relsize)
+
+  local config = {
+    relative = "editor",
+    anchor = "NW",
+    width = width - b_width,
+    height = height - b_height,
+    row = math.floor((t_height - height) / 2) + 1,
+    col = math.floor((t_width - width) / 2) + 1,
+    focusable = true,
+    border = border
+  }
+
+  if win and vim.api.nvim_win_is_valid(win) then
+    if vim.api.nvim_call_function("has", {"nvim-0.10"}) == 1 then
+      config.hide = false
+    end
+    vim.api.nvim_win_set_config(win, config)
+    vim.api.nvim_win_set_buf(win, buf)
+    vim.api.nvim_set_current_win(win)
+  else
+    config.style = "minimal"
+    config.noautocmd = true
+    win = vim.api.nvim_open_win(buf, true, config)
+  end
+
+  vim.api.nvim_win_set_option(win, "winhighlight", "Normal:Floating")
+  vim.api.nvim_win_set_var(win, ns, uid)
+  vim.api.nvim_buf_set_var(buf, ns, uid)
+  return win
+end)(...)
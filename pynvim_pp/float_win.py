@@ -1,15 +1,60 @@
 from dataclasses import dataclass
 from math import floor
-from typing import AsyncIterator, Literal, Tuple, Union
+from typing import (
+    AsyncIterator,
+    Literal,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 from uuid import UUID, uuid4
 
 from .atomic import Atomic
+from .autocmd import AutoCMD
 from .buffer import Buffer
-from .lib import display_width
+from .handler import RPC
+from .lib import decode, display_width
 from .nvim import Nvim
-from .types import NoneType, NvimPos
+from .types import PARENT, NoneType, NvimPos
 from .window import Window
 
+_LUA_FLOAT = decode((PARENT / "float_win.lua").read_bytes().strip())
+
+_LUA_CLOSE = """
+for _, win in ipairs(...) do
+  if vim.api.nvim_win_is_valid(win) then
+    vim.api.nvim_win_close(win, true)
+  end
+end
+"""
+
+_LUA_VALID = """
+local acc = {}
+for i, win in ipairs(...) do
+  acc[i] = vim.api.nvim_win_is_valid(win)
+end
+return acc
+"""
+
+_LUA_HIDE = """
+local win = ...
+if not vim.api.nvim_win_is_valid(win) then
+  return false
+elseif vim.api.nvim_call_function("has", {"nvim-0.10"}) == 1 then
+  if vim.api.nvim_get_current_win() == win then
+    vim.api.nvim_command("wincmd p")
+  end
+  vim.api.nvim_win_set_config(win, {hide = true})
+  return true
+else
+  vim.api.nvim_win_close(win, true)
+  return false
+end
+"""
+
 
 @dataclass(frozen=True)
 class FloatWin:
@@ -35,10 +80,41 @@ Border = Union[
 ]
 
 
+_REGISTRY: MutableMapping[UUID, MutableMapping[Window, FloatWin]] = {}
+_IDLE: MutableMapping[UUID, MutableSequence[Window]] = {}
+
+
+def _track(ns: UUID, float_win: FloatWin) -> None:
+    _REGISTRY.setdefault(ns, {})[float_win.win] = float_win
+
+
+def _untrack(win: Window) -> None:
+    for wins in _REGISTRY.values():
+        wins.pop(win, None)
+
+
+def hook_winclosed(rpc: RPC, autocmd: AutoCMD) -> None:
+    @rpc(blocking=False, name=f"Pynvim_pp_float_win_closed_{uuid4().hex}")
+    async def _on_closed(win: int) -> None:
+        _untrack(Window.from_int(win))
+
+    autocmd("WinClosed") << f"call {_on_closed.method}(+expand('<amatch>'))"
+
+
 async def list_floatwins(ns: UUID) -> AsyncIterator[Window]:
-    for win in await Window.list():
-        if await win.vars.has(str(ns)):
-            yield win
+    tracked = _REGISTRY.get(ns, {})
+    if wins := tuple(tracked):
+        valid = await Nvim.api.execute_lua(NoneType, _LUA_VALID, (wins,))
+        for win, alive in zip(wins, cast(Sequence[bool], valid)):
+            if alive:
+                yield win
+            else:
+                tracked.pop(win, None)
+
+
+async def close_floatwins(ns: UUID) -> None:
+    if wins := (*_REGISTRY.pop(ns, {}), *_IDLE.pop(ns, ())):
+        await Nvim.api.execute_lua(NoneType, _LUA_CLOSE, (wins,))
 
 
 def border_w_h(
@@ -126,4 +202,42 @@ async def open_float_win(
     atomic.buf_set_var(buf, str(ns), uid)
     await atomic.commit(NoneType)
 
-    return FloatWin(uid=uid, win=win, buf=buf)
+    float_win = FloatWin(uid=uid, win=win, buf=buf)
+    _track(ns, float_win=float_win)
+    return float_win
+
+
+class FloatPool:
+    def __init__(self, ns: UUID) -> None:
+        self._ns = ns
+
+    async def open(
+        self,
+        margin: int,
+        relsize: float,
+        buf: Buffer,
+        border: Border,
+    ) -> FloatWin:
+        assert margin >= 0
+        assert 0 < relsize < 1
+        idle = _IDLE.get(self._ns)
+        win = idle.pop() if idle else None
+        b_width, b_height = border_w_h(border)
+        uid = uuid4().hex
+        handle = await Nvim.api.execute_lua(
+            int,
+            _LUA_FLOAT,
+            (win, buf, str(self._ns), uid, margin, relsize, b_width, b_height, border),
+        )
+        float_win = FloatWin(uid=uid, win=Window.from_int(handle), buf=buf)
+        _track(self._ns, float_win=float_win)
+        return float_win
+
+    async def close(self, float_win: FloatWin) -> None:
+        _untrack(float_win.win)
+        if await Nvim.api.execute_lua(bool, _LUA_HIDE, (float_win.win,)):
+            _IDLE.setdefault(self._ns, []).append(float_win.win)
+
+    async def clear(self) -> None:
+        if wins := tuple(_IDLE.pop(self._ns, ())):
+            await Nvim.api.execute_lua(NoneType, _LUA_CLOSE, (wins,))
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from inspect import iscoroutinefunction
 from typing import (
     Any,
+    AsyncIterator,
     Awaitable,
     Callable,
     Coroutine,
+    Iterable,
     Mapping,
     MutableMapping,
     Optional,
@@ -17,8 +21,8 @@ from uuid import uuid4
 
 from .atomic import Atomic
 from .lib import decode
-from .rpc_types import Chan, Method, RPCallable
-from .types import PARENT, HasChan
+from .rpc_types import Chan, Method, RPCallable, RPClient
+from .types import PARENT, HasChan, NoneType
 
 _T = TypeVar("_T")
 
@@ -26,32 +30,54 @@ _T = TypeVar("_T")
 GLOBAL_NS = str(uuid4())
 
 _LUA_PRC = decode((PARENT / "rpc.lua").read_bytes().strip())
+_LUA_RELEASE = decode((PARENT / "release.lua").read_bytes().strip())
 
 
-def _new_lua_func(atomic: Atomic, chan: Chan, handler: RPCallable[Any]) -> None:
+@dataclass(frozen=True)
+class HandlerCounts:
+    registered: int
+    live: int
+    pending: int
+
+
+def _viml_name(handler: RPCallable[Any]) -> str:
+    return handler.method[:1].upper() + handler.method[1:]
+
+
+def _spec(handler: RPCallable[Any]) -> Tuple[str, bool, str, str, str, str]:
     method = "rpcrequest" if handler.blocking else "rpcnotify"
-    atomic.execute_lua(
-        _LUA_PRC,
-        (
-            GLOBAL_NS,
-            method,
-            chan,
-            handler.schedule,
-            str(handler.uuid),
-            handler.namespace,
-            handler.method,
-        ),
+    return (
+        method,
+        handler.schedule,
+        str(handler.uuid),
+        handler.namespace,
+        handler.method,
+        _viml_name(handler),
     )
 
 
-def _new_viml_func(atomic: Atomic, handler: RPCallable[Any]) -> None:
-    method = handler.method[:1].upper() + handler.method[1:]
-    viml = f"""
-    function! {method}(...)
-      return luaeval('_G["{handler.namespace}"]["{method}"](unpack(_A))', a:000)
-    endfunction
-    """
-    atomic.command(viml)
+def _install(chan: Chan, lazy: bool, handlers: Iterable[RPCallable[Any]]) -> Atomic:
+    atomic = Atomic()
+    if specs := tuple(map(_spec, handlers)):
+        atomic.execute_lua(_LUA_PRC, (GLOBAL_NS, chan, lazy, specs))
+    return atomic
+
+
+def release(*handlers: RPCallable[Any]) -> Atomic:
+    specs = tuple(
+        (str(handler.uuid), handler.namespace, handler.method, _viml_name(handler))
+        for handler in handlers
+    )
+    atomic = Atomic()
+    atomic.execute_lua(_LUA_RELEASE, (GLOBAL_NS, specs))
+    return atomic
+
+
+async def handler_counts(client: RPClient) -> HandlerCounts:
+    live, pending = cast(Tuple[int, int], (await release().commit(NoneType))[0])
+    return HandlerCounts(
+        registered=sum(client.registered.values()), live=live, pending=pending
+    )
 
 
 def _name_gen(fn: Callable[..., Awaitable[Any]]) -> str:
@@ -89,13 +115,30 @@ class RPC(HasChan):
 
         return decor
 
-    def drain(self) -> Tuple[Atomic, Mapping[Method, RPCallable[Any]]]:
-        atomic = Atomic()
+    def drain(
+        self, lazy: bool = False
+    ) -> Tuple[Atomic, Mapping[Method, RPCallable[Any]]]:
         specs: MutableMapping[Method, RPCallable[Any]] = {}
         while self._handlers:
             name, handler = self._handlers.popitem()
-            _new_lua_func(atomic, chan=self.chan, handler=handler)
-            _new_viml_func(atomic, handler=handler)
             specs[name] = handler
 
+        atomic = _install(self.chan, lazy=lazy, handlers=specs.values())
         return atomic, specs
+
+    @asynccontextmanager
+    async def scoped(
+        self, client: RPClient, *handlers: RPCallable[Any]
+    ) -> AsyncIterator[None]:
+        for handler in handlers:
+            self._handlers.pop(handler.method, None)
+
+        fresh = tuple(handler for handler in handlers if client.register(handler))
+        try:
+            if fresh:
+                await _install(self.chan, lazy=False, handlers=fresh).commit(NoneType)
+            yield None
+        finally:
+            dead = tuple(handler for handler in handlers if client.unregister(handler))
+            if dead:
+                await release(*dead).commit(NoneType)
@@ -1,7 +1,32 @@
 from dataclasses import dataclass
-from typing import AbstractSet, Optional
+from typing import (
+    AbstractSet,
+    Any,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 from .atomic import Atomic
+from .rpc_types import NvimError
+from .types import NoneType
+from .window import Window
+
+_LUA_WIN_NS = """
+local wins, ns, tracked = ...
+local applied, alive = {}, {}
+for i, win in ipairs(wins) do
+  applied[i] = vim.api.nvim_win_is_valid(win) and pcall(vim.api.nvim_win_set_hl_ns, win, ns)
+end
+for i, win in ipairs(tracked) do
+  alive[i] = vim.api.nvim_win_is_valid(win)
+end
+return {applied, alive}
+"""
 
 
 @dataclass(frozen=True)
@@ -40,3 +65,80 @@ def hl_link(default: bool, **links: str) -> Atomic:
         link = f"highlight {df} link {src} {dest}"
         atomic.command(link)
     return atomic
+
+
+def _hl_def(group: HLgroup) -> Mapping[str, Any]:
+    spec = {
+        "default": group.default,
+        "cterm": {attr: True for attr in sorted(group.cterm)},
+        "ctermfg": group.ctermfg,
+        "ctermbg": group.ctermbg,
+        "fg": group.guifg,
+        "bg": group.guibg,
+    }
+    return {key: val for key, val in spec.items() if val is not None}
+
+
+class Highlights:
+    def __init__(self) -> None:
+        self._applied: MutableMapping[int, MutableMapping[str, Mapping[str, Any]]] = {}
+        self._wins: MutableMapping[Window, int] = {}
+
+    async def _set(self, ns: int, defs: Mapping[str, Mapping[str, Any]]) -> None:
+        applied = self._applied.get(ns, {})
+        changed = {
+            name: spec
+            for name, spec in defs.items()
+            if not ns or applied.get(name) != spec
+        }
+
+        atomic = Atomic()
+        for name, spec in changed.items():
+            atomic.set_hl(ns, name, spec)
+
+        if any(atomic):
+            try:
+                await atomic.commit(NoneType)
+            except NvimError:
+                self._applied.pop(ns, None)
+                raise
+
+        if ns:
+            self._applied.setdefault(ns, {}).update(changed)
+
+    async def define(self, *groups: HLgroup, ns: int = 0) -> None:
+        await self._set(ns, defs={group.name: _hl_def(group) for group in groups})
+
+    async def link(self, default: bool, ns: int = 0, **links: str) -> None:
+        defs = {src: {"link": dest, "default": default} for src, dest in links.items()}
+        await self._set(ns, defs=defs)
+
+    async def win_set_ns(self, wins: Iterable[Window], ns: int) -> None:
+        targets = tuple(dict.fromkeys(win for win in wins if self._wins.get(win) != ns))
+        if targets:
+            tracked = tuple(self._wins)
+            with Atomic() as (atomic, a_ns):
+                a_ns.state = atomic.execute_lua(_LUA_WIN_NS, (targets, ns, tracked))
+                await atomic.commit(NoneType)
+
+            applied, alive = cast(
+                Tuple[Sequence[bool], Sequence[bool]], a_ns.state(NoneType)
+            )
+            for win, ok in zip(tracked, alive):
+                if not ok:
+                    self._wins.pop(win, None)
+            for win, ok in zip(targets, applied):
+                if ok:
+                    self._wins[win] = ns
+                else:
+                    self._wins.pop(win, None)
+
+    def forget(self, ns: Optional[int] = None) -> None:
+        if ns is None:
+            self._applied.clear()
+            self._wins.clear()
+        else:
+            self._applied.pop(ns, None)
+            for win, win_ns in tuple(self._wins.items()):
+                if win_ns == ns:
+                    self._wins.pop(win)
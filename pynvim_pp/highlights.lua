@@ -0,0 +1,28 @@
+return (function(gns)
+  local global_namespace = _G[gns] or {}
+  _G[gns] = global_namespace
+
+  local add_hl = function(buf, ns, virtual, groups, rows, cols, tails, gids)
+    if virtual then
+      local set_mark = vim.api.nvim_buf_set_extmark
+      for i = 1, #rows do
+        set_mark(
+          buf,
+          ns,
+          rows[i],
+          cols[i],
+          {virt_text = {{tails[i], groups[gids[i] + 1]}}}
+        )
+      end
+    else
+      local add = vim.api.nvim_buf_add_highlight
+      for i = 1, #rows do
+        local col, len = cols[i], tails[i]
+        local col_end = len < 0 and -1 or col + len
+        add(buf, ns, groups[gids[i] + 1], rows[i], col, col_end)
+      end
+    end
+  end
+
+  rawset(global_namespace, "pynvim_pp_add_hl", add_hl)
+end)(...)
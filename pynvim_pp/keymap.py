@@ -1,10 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
-from typing import Iterable, MutableMapping, Optional, Tuple
+from typing import (
+    Any,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 from .atomic import Atomic
 from .buffer import Buffer
+from .rpc_types import NvimError
+from .types import NoneType
 
 
 @dataclass(frozen=True)
@@ -16,8 +28,58 @@ class KeymapOpts:
     unique: bool = False
 
 
+_Mappings = Mapping[Tuple[str, str], Tuple[KeymapOpts, str]]
+
 _KEY_MODES = {"n", "o", "v", "i", "c", "t"}
 
+_LUA_UNMAP = """
+local buf, keys = ...
+for _, key in ipairs(keys) do
+  if buf == nil or buf == vim.NIL then
+    pcall(vim.api.nvim_del_keymap, key[1], key[2])
+  else
+    pcall(vim.api.nvim_buf_del_keymap, buf, key[1], key[2])
+  end
+end
+"""
+
+_LUA_STAMP = """
+local apply = function(spec)
+  local buf = spec.buf
+  for _, del in ipairs(spec.dels) do
+    pcall(vim.api.nvim_buf_del_keymap, buf, del[1], del[2])
+  end
+  for _, set in ipairs(spec.sets) do
+    vim.api.nvim_buf_set_keymap(buf, set[1], set[2], set[3], set[4])
+  end
+end
+
+local acc = {}
+for i, spec in ipairs(...) do
+  acc[i] = vim.api.nvim_buf_is_valid(spec.buf) and pcall(apply, spec)
+end
+return acc
+"""
+
+
+def _diff(
+    prev: _Mappings, mappings: _Mappings
+) -> Tuple[Sequence[Tuple[str, str]], Sequence[Tuple[str, str, str, Any]]]:
+    dels = [
+        *(key for key in prev if key not in mappings),
+        *(
+            key
+            for key, (opts, rhs) in mappings.items()
+            if opts.unique and prev.get(key) != (opts, rhs)
+        ),
+    ]
+    sets = [
+        (mode, lhs, rhs, asdict(opts))
+        for (mode, lhs), (opts, rhs) in mappings.items()
+        if prev.get((mode, lhs)) != (opts, rhs)
+    ]
+    return dels, sets
+
 
 class _K:
     def __init__(
@@ -70,6 +132,7 @@ class Keymap:
             Tuple[str, str],
             Tuple[KeymapOpts, str],
         ] = {}
+        self._applied: MutableMapping[Optional[Buffer], _Mappings] = {}
 
     def __getattr__(self, modes: str) -> _KM:
         for mode in modes:
@@ -88,3 +151,59 @@ class Keymap:
                 atomic.buf_set_keymap(buf, mode, lhs, rhs, asdict(opts))
 
         return atomic
+
+    def discard(self, modes: str, lhs: str) -> None:
+        for mode in modes:
+            self._mappings.pop((mode, lhs), None)
+
+    async def sync(self, buf: Optional[Buffer]) -> None:
+        mappings = {**self._mappings}
+        dels, sets = _diff(self._applied.get(buf, {}), mappings=mappings)
+
+        atomic = Atomic()
+        if dels:
+            atomic.execute_lua(_LUA_UNMAP, (buf, dels))
+        for mode, lhs, rhs, opts in sets:
+            if buf is None:
+                atomic.set_keymap(mode, lhs, rhs, opts)
+            else:
+                atomic.buf_set_keymap(buf, mode, lhs, rhs, opts)
+
+        if any(atomic):
+            try:
+                await atomic.commit(NoneType)
+            except NvimError:
+                self._applied.pop(buf, None)
+                raise
+
+        self._applied[buf] = mappings
+
+    async def stamp(self, bufs: Iterable[Buffer]) -> None:
+        mappings = {**self._mappings}
+        pending: MutableSequence[Buffer] = []
+        specs: MutableSequence[Mapping[str, Any]] = []
+        for buf in bufs:
+            dels, sets = _diff(self._applied.get(buf, {}), mappings=mappings)
+            if dels or sets:
+                pending.append(buf)
+                specs.append({"buf": buf, "dels": dels, "sets": sets})
+
+        if specs:
+            with Atomic() as (atomic, ns):
+                ns.applied = atomic.execute_lua(_LUA_STAMP, (specs,))
+                try:
+                    await atomic.commit(NoneType)
+                except NvimError:
+                    for buf in pending:
+                        self._applied.pop(buf, None)
+                    raise
+
+            applied = cast(Sequence[bool], ns.applied(NoneType))
+            for buf, ok in zip(pending, applied):
+                if ok:
+                    self._applied[buf] = mappings
+                else:
+                    self._applied.pop(buf, None)
+
+    def forget(self, buf: Optional[Buffer]) -> None:
+        self._applied.pop(buf, None)
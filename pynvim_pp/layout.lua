@@ -0,0 +1,39 @@
+return (function(win_opts, win_vars, buf_opts)
+  local collect = function(keys, get, handle)
+    local acc = {}
+    for _, key in ipairs(keys) do
+      local ok, val = pcall(get, handle, key)
+      if ok then
+        acc[key] = val
+      end
+    end
+    return acc
+  end
+
+  local tabs = {}
+  for i, tab in ipairs(vim.api.nvim_list_tabpages()) do
+    local wins = {}
+    for j, win in ipairs(vim.api.nvim_tabpage_list_wins(tab)) do
+      local buf = vim.api.nvim_win_get_buf(win)
+      local config = vim.api.nvim_win_get_config(win)
+      wins[j] = {
+        win,
+        buf,
+        vim.api.nvim_win_get_width(win),
+        vim.api.nvim_win_get_height(win),
+        vim.api.nvim_win_get_position(win),
+        config.relative ~= "" and config or vim.NIL,
+        collect(win_opts, vim.api.nvim_win_get_option, win),
+        collect(win_vars, vim.api.nvim_win_get_var, win),
+        collect(buf_opts, vim.api.nvim_buf_get_option, buf)
+      }
+    end
+    tabs[i] = {tab, wins}
+  end
+
+  return {
+    vim.api.nvim_get_current_tabpage(),
+    vim.api.nvim_get_current_win(),
+    tabs
+  }
+end)(...)
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, cast
+
+from .buffer import Buffer
+from .lib import decode
+from .nvim import Nvim
+from .tabpage import Tabpage
+from .types import PARENT, NoneType
+from .window import Window
+
+_LUA_LAYOUT = decode((PARENT / "layout.lua").read_bytes().strip())
+
+
+@dataclass(frozen=True)
+class WinLayout:
+    win: Window
+    buf: Buffer
+    width: int
+    height: int
+    position: Tuple[int, int]
+    float_config: Optional[Mapping[str, Any]]
+    opts: Mapping[str, Any]
+    vars: Mapping[str, Any]
+    buf_opts: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class TabLayout:
+    tab: Tabpage
+    wins: Sequence[WinLayout]
+
+
+@dataclass(frozen=True)
+class Layout:
+    tab: Tabpage
+    win: Window
+    tabs: Sequence[TabLayout]
+
+    def current(self) -> TabLayout:
+        return next(tab for tab in self.tabs if tab.tab == self.tab)
+
+
+async def layout_snapshot(
+    win_opts: Iterable[str] = (),
+    win_vars: Iterable[str] = (),
+    buf_opts: Iterable[str] = (),
+) -> Layout:
+    tab, win, tabs = cast(
+        Tuple[int, int, Sequence[Tuple[int, Sequence[Sequence[Any]]]]],
+        await Nvim.api.execute_lua(
+            NoneType,
+            _LUA_LAYOUT,
+            (tuple(win_opts), tuple(win_vars), tuple(buf_opts)),
+        ),
+    )
+
+    def wins(raw: Sequence[Sequence[Any]]) -> Iterator[WinLayout]:
+        for win, buf, width, height, (row, col), conf, opts, vars, b_opts in raw:
+            yield WinLayout(
+                win=Window.from_int(win),
+                buf=Buffer.from_int(buf),
+                width=width,
+                height=height,
+                position=(row, col),
+                float_config=conf,
+                opts=opts or {},
+                vars=vars or {},
+                buf_opts=b_opts or {},
+            )
+
+    layout = Layout(
+        tab=Tabpage.from_int(tab),
+        win=Window.from_int(win),
+        tabs=tuple(
+            TabLayout(tab=Tabpage.from_int(tab), wins=tuple(wins(raw)))
+            for tab, raw in tabs
+        ),
+    )
+    return layout
@@ -1,9 +1,11 @@
 from asyncio import get_running_loop
+from functools import lru_cache
 from os import PathLike, name
 from os.path import normpath
 from pathlib import Path
 from string import ascii_lowercase
-from typing import Iterator, Literal, Optional, Union
+from threading import Lock
+from typing import Iterable, Literal, MutableMapping, Optional, Sequence, Union
 from unicodedata import east_asian_width
 from urllib.parse import urlsplit
 
@@ -29,18 +31,36 @@ def recode(text: str) -> str:
     return text.encode("UTF-8", errors="ignore").decode("UTF-8")
 
 
+def _char_width(char: str) -> int:
+    if char == "\t":
+        return 0
+    elif char in _SPECIAL:
+        return 2
+    else:
+        code = east_asian_width(char)
+        return _UNICODE_WIDTH_LOOKUP.get(code, 1)
+
+
+_CHAR_WIDTHS = {chr(code): _char_width(chr(code)) for code in range(128)}
+
+
+@lru_cache(maxsize=4096)
 def display_width(text: str, tabsize: int) -> int:
-    def cont() -> Iterator[int]:
-        for char in text:
-            if char == "\t":
-                yield tabsize
-            elif char in _SPECIAL:
-                yield 2
-            else:
-                code = east_asian_width(char)
-                yield _UNICODE_WIDTH_LOOKUP.get(code, 1)
+    if text.isascii() and text.isprintable():
+        return len(text)
+    else:
+        try:
+            width = sum(map(_CHAR_WIDTHS.__getitem__, text))
+        except KeyError:
+            for char in text:
+                if char not in _CHAR_WIDTHS:
+                    _CHAR_WIDTHS[char] = _char_width(char)
+            width = sum(map(_CHAR_WIDTHS.__getitem__, text))
+        return width + text.count("\t") * tabsize
 
-    return sum(cont())
+
+def display_widths(texts: Iterable[str], tabsize: int) -> Sequence[int]:
+    return tuple(display_width(text, tabsize=tabsize) for text in texts)
 
 
 def _expanduser(path: Path) -> Path:
@@ -69,21 +89,62 @@ def _safe_path(path: Union[PathLike, str]) -> Optional[Path]:
             return None
 
 
+def _resolve_path(cwd: Optional[Path], path: Union[PathLike, str]) -> Optional[Path]:
+    if not (safe_path := _safe_path(path)):
+        return None
+    elif safe_path.is_absolute():
+        return safe_path
+    elif (resolved := _expanduser(safe_path)) != safe_path:
+        return resolved
+    elif cwd:
+        return cwd / path
+    else:
+        return None
+
+
+class _ResolveCache:
+    def __init__(self, maxsize: int) -> None:
+        self._lock = Lock()
+        self._maxsize = maxsize
+        self._cwd: Optional[Path] = None
+        self._cache: MutableMapping[Union[PathLike, str], Optional[Path]] = {}
+
+    def resolve(
+        self, cwd: Optional[Path], path: Union[PathLike, str]
+    ) -> Optional[Path]:
+        with self._lock:
+            if cwd != self._cwd:
+                self._cache.clear()
+                self._cwd = cwd
+            elif path in self._cache:
+                return self._cache[path]
+
+        resolved = _resolve_path(cwd, path=path)
+        with self._lock:
+            if cwd == self._cwd:
+                self._cache[path] = resolved
+                while len(self._cache) > self._maxsize:
+                    self._cache.pop(next(iter(self._cache)))
+        return resolved
+
+
+_RESOLVED = _ResolveCache(maxsize=1024)
+
+
 async def resolve_path(
     cwd: Optional[Path], path: Union[PathLike, str]
 ) -> Optional[Path]:
+    (resolved,) = await resolve_paths(cwd, paths=(path,))
+    return resolved
+
+
+async def resolve_paths(
+    cwd: Optional[Path], paths: Iterable[Union[PathLike, str]]
+) -> Sequence[Optional[Path]]:
     loop = get_running_loop()
+    paths = tuple(paths)
 
-    def cont() -> Optional[Path]:
-        if not (safe_path := _safe_path(path)):
-            return None
-        elif safe_path.is_absolute():
-            return safe_path
-        elif (resolved := _expanduser(safe_path)) != safe_path:
-            return resolved
-        elif cwd:
-            return cwd / path
-        else:
-            return None
+    def cont() -> Sequence[Optional[Path]]:
+        return tuple(_RESOLVED.resolve(cwd, path=path) for path in paths)
 
     return await loop.run_in_executor(None, cont)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    MutableMapping,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+from uuid import uuid4
+from weakref import WeakSet
+
+from .autocmd import AutoCMD
+from .buffer import Buffer, BufNum
+from .handler import RPC
+from .nvim import Nvim
+from .rpc_types import NvimError
+from .types import NoneType
+
+_T = TypeVar("_T")
+
+_CACHES: WeakSet[TickCache] = WeakSet()
+
+_LUA_TICKS = """
+local acc = {}
+for i, buf in ipairs(...) do
+  acc[i] = vim.api.nvim_buf_is_valid(buf) and vim.api.nvim_buf_get_changedtick(buf) or -1
+end
+return acc
+"""
+
+
+async def changed_ticks(bufs: Iterable[Buffer]) -> Sequence[int]:
+    if bufs := tuple(bufs):
+        ticks = await Nvim.api.execute_lua(NoneType, _LUA_TICKS, (bufs,))
+        return cast(Sequence[int], ticks)
+    else:
+        return ()
+
+
+class TickCache(Generic[_T]):
+    def __init__(self, fn: Callable[[Buffer], Awaitable[_T]], maxsize: int) -> None:
+        assert maxsize > 0
+        self._fn, self._maxsize = fn, maxsize
+        self._store: MutableMapping[BufNum, Tuple[int, _T]] = {}
+        _CACHES.add(self)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    async def _get(self, buf: Buffer, tick: int) -> _T:
+        if (hit := self._store.pop(buf.number, None)) and hit[0] == tick:
+            self._store[buf.number] = hit
+            _, val = hit
+            return val
+        else:
+            val = await self._fn(buf)
+            self._store[buf.number] = (tick, val)
+            while len(self._store) > self._maxsize:
+                self._store.pop(next(iter(self._store)))
+            return val
+
+    async def __call__(self, buf: Buffer) -> _T:
+        tick = await buf.changed_tick()
+        return await self._get(buf, tick=tick)
+
+    async def many(self, bufs: Iterable[Buffer]) -> Sequence[_T]:
+        bufs = tuple(bufs)
+        ticks = await changed_ticks(bufs)
+        if dead := tuple(buf for buf, tick in zip(bufs, ticks) if tick < 0):
+            for buf in dead:
+                self.evict(buf.number)
+            raise NvimError(("Invalid buffer", dead))
+        return tuple(
+            [await self._get(buf, tick=tick) for buf, tick in zip(bufs, ticks)]
+        )
+
+    async def validate(self) -> None:
+        nums = tuple(self._store)
+        ticks = await changed_ticks(map(Buffer.from_int, nums))
+        for num, tick in zip(nums, ticks):
+            if (hit := self._store.get(num)) and hit[0] != tick:
+                self._store.pop(num, None)
+
+    def evict(self, num: BufNum) -> None:
+        self._store.pop(num, None)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+
+def tick_cache(
+    maxsize: int = 128,
+) -> Callable[[Callable[[Buffer], Awaitable[_T]]], TickCache[_T]]:
+    def decor(fn: Callable[[Buffer], Awaitable[_T]]) -> TickCache[_T]:
+        return TickCache(fn, maxsize=maxsize)
+
+    return decor
+
+
+def hook_wipeout(rpc: RPC, autocmd: AutoCMD) -> None:
+    @rpc(blocking=False, name=f"Pynvim_pp_memo_wipeout_{uuid4().hex}")
+    async def _on_wipeout(num: int) -> None:
+        for cache in tuple(_CACHES):
+            cache.evict(BufNum(num))
+
+    autocmd("BufWipeout") << f"call {_on_wipeout.method}(+expand('<abuf>'))"
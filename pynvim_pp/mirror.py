@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Iterable,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    cast,
+)
+from uuid import uuid4
+
+from .atomic import Atomic
+from .buffer import Buffer
+from .rpc_types import Method, NvimError, RPCallable
+from .types import NoneType
+
+Listener = Callable[[int, int, Sequence[str]], None]
+
+_MIRRORS: MutableMapping[Buffer, BufferMirror] = {}
+
+
+def _notif(
+    method: str,
+) -> Callable[[Callable[..., Coroutine[Any, Any, None]]], RPCallable[None]]:
+    def decor(handler: Callable[..., Coroutine[Any, Any, None]]) -> RPCallable[None]:
+        setattr(handler, "uuid", uuid4())
+        setattr(handler, "blocking", False)
+        setattr(handler, "schedule", False)
+        setattr(handler, "namespace", __name__)
+        setattr(handler, "method", Method(method))
+        return cast(RPCallable[None], cast(Any, handler))
+
+    return decor
+
+
+def _slice(length: int, lo: int, hi: int) -> slice:
+    lo = lo if lo >= 0 else length + lo + 1
+    hi = hi if hi >= 0 else length + hi + 1
+    return slice(lo, hi)
+
+
+class BufferMirror:
+    def __init__(self, buf: Buffer, listeners: Iterable[Listener] = ()) -> None:
+        self.buf = buf
+        self.listeners: MutableSequence[Listener] = [*listeners]
+        self._lines: MutableSequence[str] = []
+        self._tick: Optional[int] = None
+        self._more = False
+        self._attached = False
+
+    @property
+    def attached(self) -> bool:
+        return self._attached
+
+    @property
+    def changed_tick(self) -> Optional[int]:
+        return self._tick
+
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    def get_lines(self, lo: int = 0, hi: int = -1) -> Sequence[str]:
+        return tuple(self._lines[_slice(len(self._lines), lo=lo, hi=hi)])
+
+    async def attach(self) -> bool:
+        _MIRRORS[self.buf] = self
+        self._tick = None
+        try:
+            self._attached = await self.buf.api.attach(bool, self.buf, True, {})
+        except NvimError:
+            self._attached = False
+        if not self._attached:
+            _MIRRORS.pop(self.buf, None)
+        return self._attached
+
+    async def detach(self) -> None:
+        _MIRRORS.pop(self.buf, None)
+        if self._attached:
+            self._attached = False
+            await self.buf.api.detach(bool, self.buf)
+
+    async def sync(self) -> None:
+        with Atomic() as (atomic, ns):
+            ns.tick = atomic.buf_get_changedtick(self.buf)
+            ns.lines = atomic.buf_get_lines(self.buf, 0, -1, True)
+            await atomic.commit(NoneType)
+
+        lines = cast(Sequence[str], ns.lines(NoneType))
+        last = len(self._lines)
+        self._lines[:] = lines
+        self._tick, self._more = ns.tick(int), False
+        for listener in self.listeners:
+            listener(0, last, lines)
+
+    async def verify(self) -> bool:
+        if await self.buf.changed_tick() == self._tick:
+            return True
+        else:
+            await self.sync()
+            return False
+
+    def _apply(
+        self,
+        tick: Optional[int],
+        first: int,
+        last: int,
+        lines: Sequence[str],
+        more: bool,
+    ) -> None:
+        stale = (
+            tick is not None
+            and self._tick is not None
+            and (tick < self._tick or (tick == self._tick and not self._more))
+        )
+        if not stale:
+            last = len(self._lines) if last == -1 else last
+            self._lines[first:last] = lines
+            self._more = more
+            if tick is not None:
+                self._tick = tick
+            for listener in self.listeners:
+                listener(first, last, lines)
+
+
+@_notif("nvim_buf_lines_event")
+async def _lines_event(
+    buf: Buffer,
+    tick: Optional[int],
+    first: int,
+    last: int,
+    lines: Sequence[str],
+    more: bool,
+) -> None:
+    if mirror := _MIRRORS.get(buf):
+        mirror._apply(tick, first=first, last=last, lines=lines, more=more)
+
+
+@_notif("nvim_buf_changedtick_event")
+async def _changedtick_event(buf: Buffer, tick: int) -> None:
+    if mirror := _MIRRORS.get(buf):
+        if tick != mirror.changed_tick:
+            await mirror.sync()
+
+
+@_notif("nvim_buf_detach_event")
+async def _detach_event(buf: Buffer) -> None:
+    if mirror := _MIRRORS.get(buf):
+        mirror._attached = False
+        await mirror.attach()
+
+
+HANDLERS: Sequence[RPCallable[None]] = (
+    _lines_event,
+    _changedtick_event,
+    _detach_event,
+)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from asyncio import gather, get_running_loop, run, wrap_future
+from asyncio import get_running_loop, run, wrap_future
 from concurrent.futures import Future, InvalidStateError
 from contextlib import asynccontextmanager, suppress
 from functools import cached_property
@@ -27,9 +27,10 @@ from uuid import UUID
 
 from ._rpc import RPCdefault, client
 from .atomic import Atomic
+from .autocmd import AutoCMD
 from .buffer import Buffer
 from .handler import GLOBAL_NS, RPC
-from .lib import decode, resolve_path
+from .lib import decode, resolve_paths
 from .rpc_types import Chan, NvimError, RPCallable, RPClient, ServerAddr
 from .tabpage import Tabpage
 from .types import (
@@ -166,7 +167,7 @@ class _Nvim(HasApi, HasChan):
 
         cwd = Path(normpath(ns.cwd(str)))
         paths = cast(Sequence[str], ns.paths(NoneType))
-        resolved = await gather(*(resolve_path(cwd, path=path) for path in paths))
+        resolved = await resolve_paths(cwd, paths=paths)
         return tuple(path for path in resolved if path)
 
     async def create_namespace(self, seed: UUID) -> BufNamespace:
@@ -195,8 +196,8 @@ class _Nvim(HasApi, HasChan):
                 for marker, (row, col, bufnr, path) in zip(ascii_uppercase, marks)
                 if (row, col) != (0, 0)
             }
-            paths = await gather(
-                *(resolve_path(cwd, path=path) for path, _, _ in acc.values())
+            paths = await resolve_paths(
+                cwd, paths=(path for path, _, _ in acc.values())
             )
             resolved = {
                 marker: (path, buf, pos)
@@ -262,7 +263,7 @@ async def conn(
                 api = Api(rpc=rpc, prefix=c.prefix)
                 c.init_api(api=api)
 
-            for cls in (_Nvim, _Lua, RPC):
+            for cls in (_Nvim, _Lua, RPC, AutoCMD):
                 cl = cast(HasChan, cls)
                 cl.init_chan(chan=rpc.chan)
 
@@ -1,5 +1,17 @@
+from collections import Counter
+from dataclasses import dataclass
+from re import compile, escape
 from string import whitespace
-from typing import Literal, Optional, Tuple, cast
+from typing import (
+    Iterable,
+    Literal,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
 
 from .atomic import Atomic
 from .buffer import Buffer
@@ -9,6 +21,8 @@ from .window import Window
 VisualMode = Literal["v", "V"]
 VisualTypes = Optional[Literal["char", "line", "block"]]
 
+_LEADING_WS = compile(f"[{escape(whitespace)}]*")
+
 
 async def operator_marks(
     buf: Buffer, visual_type: VisualTypes
@@ -48,10 +62,62 @@ async def set_visual_selection(
 
 
 def p_indent(line: str, tabsize: int) -> int:
-    ws = {*whitespace}
-    spaces = " " * tabsize
-    for idx, char in enumerate(line.replace("\t", spaces), start=1):
-        if char not in ws:
-            return idx - 1
+    match = _LEADING_WS.match(line)
+    if (lead := match.end() if match else 0) < len(line):
+        return lead + line.count("\t", 0, lead) * (tabsize - 1)
     else:
         return 0
+
+
+def indents(lines: Iterable[str], tabsize: int) -> Sequence[int]:
+    return tuple(p_indent(line, tabsize=tabsize) for line in lines)
+
+
+@dataclass(frozen=True)
+class IndentStyle:
+    expandtab: bool
+    width: int
+
+
+class _IndentTally:
+    def __init__(self, tabsize: int) -> None:
+        self._tabsize = tabsize
+        self._tabbed, self._spaced, self._prev = 0, 0, 0
+        self._deltas: MutableMapping[int, int] = Counter()
+
+    def feed(self, lines: Iterable[str]) -> Sequence[int]:
+        acc: MutableSequence[int] = []
+        for line in lines:
+            indent = p_indent(line, tabsize=self._tabsize)
+            acc.append(indent)
+            if indent:
+                if line[0] == "\t":
+                    self._tabbed += 1
+                else:
+                    self._spaced += 1
+                    if (delta := indent - self._prev) > 0:
+                        self._deltas[delta] += 1
+                self._prev = indent
+            elif line.strip():
+                self._prev = 0
+        return acc
+
+    def style(self) -> IndentStyle:
+        width = max(self._deltas, key=self._deltas.__getitem__, default=self._tabsize)
+        return IndentStyle(expandtab=self._spaced >= self._tabbed, width=width)
+
+
+def detect_indent(lines: Iterable[str], tabsize: int) -> IndentStyle:
+    tally = _IndentTally(tabsize)
+    tally.feed(lines)
+    return tally.style()
+
+
+async def buf_indents(
+    buf: Buffer, tabsize: int, lo: int = 0, hi: int = -1, page: int = 4096
+) -> Tuple[Sequence[int], IndentStyle]:
+    tally = _IndentTally(tabsize)
+    acc: MutableSequence[int] = []
+    async for lines in buf.stream_lines(lo, hi, page=page):
+        acc.extend(tally.feed(lines))
+    return tuple(acc), tally.style()
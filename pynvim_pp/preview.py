@@ -2,20 +2,22 @@ from typing import Optional, Sequence, Tuple
 
 from .atomic import Atomic
 from .buffer import Buffer
+from .layout import layout_snapshot
 from .tabpage import Tabpage
 from .types import NoneType
 from .window import Window
 
 
 async def preview_windows(tab: Optional[Tabpage] = None) -> Sequence[Window]:
-    tab = tab or await Tabpage.get_current()
-    wins = await tab.list_wins()
-    atomic = Atomic()
-    for win in wins:
-        atomic.win_get_option(win, "previewwindow")
-
-    prv = await atomic.commit(bool)
-    previews = tuple(win for win, preview in zip(wins, prv) if preview)
+    layout = await layout_snapshot(win_opts=("previewwindow",))
+    tab = tab or layout.tab
+    previews = tuple(
+        win.win
+        for tab_layout in layout.tabs
+        if tab_layout.tab == tab
+        for win in tab_layout.wins
+        if win.opts.get("previewwindow")
+    )
     return previews
 
 
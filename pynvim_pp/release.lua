@@ -0,0 +1,39 @@
+return (function(gns, specs)
+  local global_namespace = _G[gns] or {}
+  _G[gns] = global_namespace
+  local lazy_ns = getmetatable(global_namespace)
+
+  for _, spec in ipairs(specs) do
+    local uuid, ns, name, viml = unpack(spec)
+
+    rawset(global_namespace, uuid, nil)
+    local namespace = _G[ns]
+    if type(namespace) == "table" then
+      rawset(namespace, name, nil)
+    end
+
+    if lazy_ns then
+      lazy_ns.uuids[uuid] = nil
+      lazy_ns.vimls[viml] = nil
+      local names = lazy_ns.names[ns]
+      if names then
+        names[name] = nil
+      end
+    end
+
+    if vim.api.nvim_call_function("exists", {"*" .. viml}) == 1 then
+      vim.api.nvim_command("delfunction " .. viml)
+    end
+  end
+
+  local live, pending = 0, 0
+  for _ in pairs(global_namespace) do
+    live = live + 1
+  end
+  if lazy_ns then
+    for _ in pairs(lazy_ns.uuids) do
+      pending = pending + 1
+    end
+  end
+  return {live, pending}
+end)(...)
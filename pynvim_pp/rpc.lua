@@ -1,40 +1,135 @@
-return (function(gns, method, chan, schedule, uuid, ns, name)
+return (function(gns, chan, lazy, specs)
   local global_namespace = _G[gns] or {}
   _G[gns] = global_namespace
 
-  local namespace = _G[ns] or {}
-  _G[ns] = namespace
-
-  local m = vim[method] or function(...)
-      vim.api.nvim_call_function(method, {...})
-    end
+  local new_fn = function(method, schedule, name)
+    local m = vim[method] or function(...)
+        return vim.api.nvim_call_function(method, {...})
+      end
 
-  local fn = function(...)
-    local argv = {...}
+    return function(...)
+      local argv = {...}
 
-    for i, arg in ipairs(argv) do
-      if type(arg) == "table" then
-        local maybe_fn = arg[gns]
-        if type(maybe_fn) == "string" then
-          local trampoline = function(...)
-            return global_namespace[maybe_fn](...)
+      for i, arg in ipairs(argv) do
+        if type(arg) == "table" then
+          local maybe_fn = arg[gns]
+          if type(maybe_fn) == "string" then
+            local trampoline = function(...)
+              return global_namespace[maybe_fn](...)
+            end
+            argv[i] = trampoline
           end
-          argv[i] = trampoline
         end
       end
+
+      if schedule then
+        vim.schedule(
+          function()
+            m(chan, name, unpack(argv))
+          end
+        )
+      else
+        return m(chan, name, unpack(argv))
+      end
     end
+  end
 
-    if schedule then
-      vim.schedule(
-        function()
-          m(chan, name, unpack(argv))
-        end
+  local new_lua = function(spec)
+    local method, schedule, uuid, ns, name = unpack(spec)
+
+    local namespace = _G[ns] or {}
+    _G[ns] = namespace
+
+    local fn = new_fn(method, schedule, name)
+    rawset(namespace, name, fn)
+    rawset(global_namespace, uuid, fn)
+    return fn
+  end
+
+  local new_viml = function(spec)
+    local _, _, _, ns, name, viml = unpack(spec)
+    vim.api.nvim_command(
+      table.concat(
+        {
+          "function! " .. viml .. "(...)",
+          "  return luaeval('_G[_A[1]][_A[2]](unpack(_A[3]))', ['" ..
+            ns .. "', '" .. name .. "', a:000])",
+          "endfunction"
+        },
+        "\n"
       )
-    else
-      return m(chan, name, unpack(argv))
+    )
+  end
+
+  if not lazy then
+    for _, spec in ipairs(specs) do
+      new_lua(spec)
+      new_viml(spec)
     end
+    return
   end
 
-  namespace[name] = fn
-  global_namespace[uuid] = fn
+  local lazy_ns = getmetatable(global_namespace)
+  if not lazy_ns then
+    lazy_ns = {uuids = {}, names = {}, vimls = {}}
+    lazy_ns.__index = function(_, uuid)
+      local thunk = lazy_ns.uuids[uuid]
+      if thunk then
+        return thunk()
+      end
+    end
+    lazy_ns.viml = function(viml)
+      local spec = lazy_ns.vimls[viml]
+      if spec then
+        lazy_ns.vimls[viml] = nil
+        new_viml(spec)
+      end
+    end
+    setmetatable(global_namespace, lazy_ns)
+
+    vim.api.nvim_command("augroup " .. gns)
+    vim.api.nvim_command("autocmd!")
+    vim.api.nvim_command(
+      "autocmd FuncUndefined * call luaeval(" ..
+        "'getmetatable(_G[_A[1]]).viml(_A[2])', ['" ..
+          gns .. "', expand('<amatch>')])"
+    )
+    vim.api.nvim_command("augroup END")
+  end
+
+  for _, spec in ipairs(specs) do
+    local _, _, uuid, ns, name, viml = unpack(spec)
+
+    local namespace = _G[ns] or {}
+    _G[ns] = namespace
+
+    local names = lazy_ns.names[ns]
+    if not names then
+      names = {}
+      lazy_ns.names[ns] = names
+      if not getmetatable(namespace) then
+        setmetatable(
+          namespace,
+          {
+            __index = function(_, key)
+              local thunk = names[key]
+              if thunk then
+                return thunk()
+              end
+            end
+          }
+        )
+      end
+    end
+
+    local thunk = function()
+      lazy_ns.uuids[uuid] = nil
+      names[name] = nil
+      return new_lua(spec)
+    end
+
+    lazy_ns.uuids[uuid] = thunk
+    names[name] = thunk
+    lazy_ns.vimls[viml] = spec
+  end
 end)(...)
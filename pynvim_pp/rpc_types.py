@@ -4,7 +4,17 @@ from abc import abstractmethod
 from enum import Enum, unique
 from ipaddress import IPv4Address, IPv6Address
 from pathlib import PurePath
-from typing import Any, Literal, NewType, Protocol, Tuple, TypeVar, Union, cast
+from typing import (
+    Any,
+    Literal,
+    Mapping,
+    NewType,
+    Protocol,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 from uuid import UUID
 
 _T_co = TypeVar("_T_co", covariant=True)
@@ -102,6 +112,15 @@ class RPClient(Protocol):
     async def request(self, method: Method, *params: Any) -> Any:
         ...
 
+    @property
+    @abstractmethod
+    def registered(self) -> Mapping[Method, int]:
+        ...
+
+    @abstractmethod
+    def register(self, f: RPCallable) -> bool:
+        ...
+
     @abstractmethod
-    def register(self, f: RPCallable) -> None:
+    def unregister(self, f: RPCallable) -> bool:
         ...
@@ -2,13 +2,20 @@ from __future__ import annotations
 
 from typing import Sequence, cast
 
-from .rpc_types import MsgPackTabpage
+from msgpack import Packer
+
+from .rpc_types import ExtData, MsgPackTabpage
 from .types import HasVOL, NoneType
-from .window import Window
+from .window import Viewport, Window, viewports
 
 
 class Tabpage(MsgPackTabpage, HasVOL):
     prefix = "nvim_tabpage"
+    _packer = Packer()
+
+    @classmethod
+    def from_int(cls, num: int) -> Tabpage:
+        return Tabpage(data=ExtData(cls._packer.pack(num)))
 
     @classmethod
     async def list(cls) -> Sequence[Tabpage]:
@@ -26,3 +33,6 @@ class Tabpage(MsgPackTabpage, HasVOL):
 
     async def list_wins(self) -> Sequence[Window]:
         return cast(Sequence[Window], await self.api.list_wins(NoneType, self))
+
+    async def viewports(self) -> Sequence[Viewport]:
+        return await viewports(self, wins=())
@@ -1,6 +1,17 @@
 from dataclasses import dataclass
-from itertools import takewhile
-from typing import AbstractSet, MutableSequence
+from functools import lru_cache
+from typing import (
+    AbstractSet,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+_SPACE, _WORD, _SYM = " ", "w", "s"
+_WINDOW = 64
 
 
 def is_word(unifying_chars: AbstractSet[str], chr: str) -> bool:
@@ -19,59 +30,91 @@ class SplitCtx:
     ws_rhs: str
 
 
-def gen_split(unifying_chars: AbstractSet[str], lhs: str, rhs: str) -> SplitCtx:
-    word_lhs: MutableSequence[str] = []
-    syms_lhs: MutableSequence[str] = []
-    word_rhs: MutableSequence[str] = []
-    syms_rhs: MutableSequence[str] = []
+class _Classes(Dict[int, str]):
+    def __init__(self, unifying_chars: AbstractSet[str]) -> None:
+        super().__init__()
+        self._unifying_chars = unifying_chars
 
-    encountered_sym = False
-    for char in reversed(lhs):
-        is_w = is_word(unifying_chars, chr=char)
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
         if char.isspace():
-            break
-        elif encountered_sym:
-            if is_w:
-                break
-            else:
-                syms_lhs.append(char)
+            cls = _SPACE
+        elif is_word(self._unifying_chars, chr=char):
+            cls = _WORD
         else:
-            if is_w:
-                word_lhs.append(char)
-            else:
-                syms_lhs.append(char)
-                encountered_sym = True
-
-    encountered_sym = False
-    for char in rhs:
-        is_w = is_word(unifying_chars, chr=char)
-        if char.isspace():
-            break
-        elif encountered_sym:
-            if is_w:
-                break
-            else:
-                syms_rhs.append(char)
+            cls = _SYM
+        self[code] = cls
+        return cls
+
+
+@lru_cache(maxsize=64)
+def _classes(unifying_chars: FrozenSet[str]) -> _Classes:
+    return _Classes(unifying_chars)
+
+
+def _scan_lhs(classes: _Classes, text: str, stop: int) -> Tuple[int, int, int]:
+    size = _WINDOW
+    while True:
+        lo = max(stop, len(text) - size)
+        cls = text[lo:].translate(classes)
+        word = cls.rstrip(_WORD)
+        syms = word.rstrip(_SYM)
+        ws = cls.rstrip(_SPACE)
+        if lo == stop or (syms and ws):
+            return lo + len(word), lo + len(syms), lo + len(ws)
+        else:
+            size *= 2
+
+
+def _scan_rhs(classes: _Classes, text: str, stop: int) -> Tuple[int, int, int]:
+    size = _WINDOW
+    while True:
+        hi = min(stop, size)
+        cls = text[:hi].translate(classes)
+        word = cls.lstrip(_WORD)
+        syms = word.lstrip(_SYM)
+        ws = cls.lstrip(_SPACE)
+        if hi == stop or (syms and ws):
+            return hi - len(word), hi - len(syms), hi - len(ws)
         else:
-            if is_w:
-                word_rhs.append(char)
-            else:
-                syms_rhs.append(char)
-                encountered_sym = True
+            size *= 2
 
-    w_lhs, w_rhs = "".join(reversed(word_lhs)), "".join(word_rhs)
 
-    ws_lhs = "".join(reversed(tuple(takewhile(lambda c: c.isspace(), reversed(lhs)))))
-    ws_rhs = "".join(takewhile(lambda c: c.isspace(), rhs))
+def _split(classes: _Classes, lhs: str, rhs: str, max_scan: Optional[int]) -> SplitCtx:
+    l_stop = max(0, len(lhs) - max_scan) if max_scan is not None else 0
+    r_stop = min(len(rhs), max_scan) if max_scan is not None else len(rhs)
+    l_word, l_syms, l_ws = _scan_lhs(classes, text=lhs, stop=l_stop)
+    r_word, r_syms, r_ws = _scan_rhs(classes, text=rhs, stop=r_stop)
 
     ctx = SplitCtx(
         lhs=lhs,
         rhs=rhs,
-        word_lhs=w_lhs,
-        word_rhs=w_rhs,
-        syms_lhs="".join(reversed(syms_lhs)) + w_lhs,
-        syms_rhs=w_rhs + "".join(syms_rhs),
-        ws_lhs=ws_lhs,
-        ws_rhs=ws_rhs,
+        word_lhs=lhs[l_word:],
+        word_rhs=rhs[:r_word],
+        syms_lhs=lhs[l_syms:],
+        syms_rhs=rhs[:r_syms],
+        ws_lhs=lhs[l_ws:],
+        ws_rhs=rhs[:r_ws],
     )
     return ctx
+
+
+def gen_split(
+    unifying_chars: AbstractSet[str],
+    lhs: str,
+    rhs: str,
+    max_scan: Optional[int] = None,
+) -> SplitCtx:
+    classes = _classes(frozenset(unifying_chars))
+    return _split(classes, lhs=lhs, rhs=rhs, max_scan=max_scan)
+
+
+def gen_splits(
+    unifying_chars: AbstractSet[str],
+    pairs: Iterable[Tuple[str, str]],
+    max_scan: Optional[int] = None,
+) -> Sequence[SplitCtx]:
+    classes = _classes(frozenset(unifying_chars))
+    return tuple(
+        _split(classes, lhs=lhs, rhs=rhs, max_scan=max_scan) for lhs, rhs in pairs
+    )
@@ -0,0 +1,16 @@
+return (function(tab, wins)
+  if tab then
+    wins = vim.api.nvim_tabpage_list_wins(tab)
+  end
+
+  local acc = {}
+  for i, win in ipairs(wins) do
+    local buf = vim.api.nvim_win_get_buf(win)
+    local top = vim.fn.line("w0", win) - 1
+    local btm = vim.fn.line("w$", win)
+    local row, col = unpack(vim.api.nvim_win_get_cursor(win))
+    local lines = vim.api.nvim_buf_get_lines(buf, top, btm, false)
+    acc[i] = {win, buf, top, btm, {row - 1, col}, lines}
+  end
+  return acc
+end)(...)
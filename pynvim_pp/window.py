@@ -1,16 +1,61 @@
 from __future__ import annotations
 
-from typing import NewType, Sequence, Tuple, cast
+from dataclasses import dataclass
+from typing import Iterable, Iterator, NewType, Optional, Sequence, Tuple, cast
+
+from msgpack import Packer
 
 from .buffer import Buffer
-from .rpc_types import MsgPackWindow
-from .types import HasVOL, NoneType, NvimPos
+from .lib import decode
+from .rpc_types import ExtData, MsgPackTabpage, MsgPackWindow
+from .types import PARENT, HasVOL, NoneType, NvimPos
+
+_LUA_VIEWPORT = decode((PARENT / "viewport.lua").read_bytes().strip())
 
 WinNum = NewType("WinNum", int)
 
 
+@dataclass(frozen=True)
+class Viewport:
+    win: Window
+    buf: Buffer
+    top: int
+    bottom: int
+    cursor: NvimPos
+    lines: Sequence[str]
+
+
+async def viewports(
+    tab: Optional[MsgPackTabpage], wins: Iterable[Window]
+) -> Sequence[Viewport]:
+    raw = cast(
+        Sequence[Tuple[int, int, int, int, NvimPos, Sequence[str]]],
+        await Window.api.execute_lua(
+            NoneType, _LUA_VIEWPORT, (tab, tuple(wins)), prefix=Window.base_prefix
+        ),
+    )
+
+    def cont() -> Iterator[Viewport]:
+        for win, buf, top, bottom, (row, col), lines in raw:
+            yield Viewport(
+                win=Window.from_int(win),
+                buf=Buffer.from_int(buf),
+                top=top,
+                bottom=bottom,
+                cursor=(row, col),
+                lines=lines,
+            )
+
+    return tuple(cont())
+
+
 class Window(MsgPackWindow, HasVOL):
     prefix = "nvim_win"
+    _packer = Packer()
+
+    @classmethod
+    def from_int(cls, num: int) -> Window:
+        return Window(data=ExtData(cls._packer.pack(num)))
 
     @classmethod
     async def list(cls) -> Sequence[Window]:
@@ -18,6 +63,10 @@ class Window(MsgPackWindow, HasVOL):
             Sequence[Window], await cls.api.list_wins(NoneType, prefix=cls.base_prefix)
         )
 
+    @classmethod
+    async def viewports(cls, wins: Iterable[Window]) -> Sequence[Viewport]:
+        return await viewports(None, wins=wins)
+
     @classmethod
     async def get_current(cls) -> Window:
         return await cls.api.get_current_win(Window, prefix=cls.base_prefix)
@@ -59,3 +108,7 @@ class Window(MsgPackWindow, HasVOL):
 
     async def get_position(self) -> Tuple[int, int]:
         return cast(Tuple[int, int], await self.api.get_position(NoneType, self))
+
+    async def viewport(self) -> Viewport:
+        (viewport,) = await viewports(None, wins=(self,))
+        return viewport
@@ -0,0 +1,114 @@
+from bisect import bisect_left, insort
+from sys import intern
+from typing import (
+    AbstractSet,
+    Iterable,
+    Iterator,
+    MutableMapping,
+    MutableSequence,
+    MutableSet,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from .atomic import Atomic
+from .buffer import Buffer
+from .text_object import is_word
+from .types import NoneType
+
+_RESORT = 1024
+
+
+def split_words(unifying_chars: AbstractSet[str], line: str) -> Iterator[str]:
+    begin: Optional[int] = None
+    for idx, char in enumerate(line):
+        if not char.isspace() and is_word(unifying_chars, chr=char):
+            if begin is None:
+                begin = idx
+        elif begin is not None:
+            yield line[begin:idx]
+            begin = None
+
+    if begin is not None:
+        yield line[begin:]
+
+
+class WordIndex:
+    def __init__(self, unifying_chars: AbstractSet[str]) -> None:
+        self._unifying_chars = frozenset(unifying_chars)
+        self._lines: MutableSequence[Tuple[str, ...]] = []
+        self._counts: MutableMapping[str, int] = {}
+        self._sorted: MutableSequence[str] = []
+        self._tick: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def _parse(self, line: str) -> Tuple[str, ...]:
+        return tuple(map(intern, split_words(self._unifying_chars, line=line)))
+
+    def _resort(self, added: Iterable[str], removed: Iterable[str]) -> None:
+        added, removed = tuple(added), tuple(removed)
+        if len(added) + len(removed) > _RESORT:
+            self._sorted = sorted(self._counts)
+        else:
+            words = self._sorted
+            for word in removed:
+                del words[bisect_left(words, word)]
+            for word in added:
+                insort(words, word)
+
+    def apply(self, first: int, last: int, lines: Sequence[str]) -> None:
+        last = len(self._lines) if last == -1 else last
+        new = tuple(map(self._parse, lines))
+        gone: MutableSet[str] = set()
+        fresh: MutableSet[str] = set()
+
+        for words in self._lines[first:last]:
+            for word in words:
+                if (count := self._counts[word] - 1) > 0:
+                    self._counts[word] = count
+                else:
+                    self._counts.pop(word)
+                    gone.add(word)
+
+        for words in new:
+            for word in words:
+                if word not in self._counts:
+                    fresh.add(word)
+                self._counts[word] = self._counts.get(word, 0) + 1
+
+        self._lines[first:last] = new
+        self._resort(fresh - gone, removed=gone - fresh)
+
+    def reset(self, lines: Sequence[str]) -> None:
+        self._lines.clear()
+        self._counts.clear()
+        self._sorted = []
+        self.apply(0, 0, lines=lines)
+
+    async def sync(self, buf: Buffer) -> None:
+        if await buf.changed_tick() != self._tick:
+            with Atomic() as (atomic, ns):
+                ns.tick = atomic.buf_get_changedtick(buf)
+                ns.lines = atomic.buf_get_lines(buf, 0, -1, True)
+                await atomic.commit(NoneType)
+
+            self.reset(cast(Sequence[str], ns.lines(NoneType)))
+            self._tick = ns.tick(int)
+
+    def count(self, word: str) -> int:
+        return self._counts.get(word, 0)
+
+    def query(self, prefix: str) -> Iterator[str]:
+        words = self._sorted
+        for idx in range(bisect_left(words, prefix), len(words)):
+            if (word := words[idx]).startswith(prefix):
+                yield word
+            else:
+                break